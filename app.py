@@ -1,6 +1,6 @@
+import math
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 
 # 1. Page Config
 st.set_page_config(page_title="Basis Transformation Sim", page_icon="📐")
@@ -12,46 +12,137 @@ st.markdown("""
 """)
 
 # 2. Sidebar Inputs
+# Inputs are rounded so FP noise from step increments doesn't miss the caches below.
 with st.sidebar:
-    st.header("1. Input Point (Global Coords)")
-    vx = st.number_input("Point X", value=3.0, step=0.5)
-    vy = st.number_input("Point Y", value=2.0, step=0.5)
+    with st.form("basis_inputs"):
+        st.header("1. Input Point (Global Coords)")
+        vx = round(st.number_input("Point X", value=3.0, step=0.5), 6)
+        vy = round(st.number_input("Point Y", value=2.0, step=0.5), 6)
     
-    st.header("2. New Basis Vectors (Green)")
-    st.write("Define the direction of the new axes:")
-    b1x = st.number_input("Axis 1 (x) coeff", value=1.0, step=0.1)
-    b1y = st.number_input("Axis 1 (y) coeff", value=2.0, step=0.1)
+        st.header("2. New Basis Vectors (Green)")
+        st.write("Define the direction of the new axes:")
+        b1x = round(st.number_input("Axis 1 (x) coeff", value=1.0, step=0.1), 6)
+        b1y = round(st.number_input("Axis 1 (y) coeff", value=2.0, step=0.1), 6)
     
-    b2x = st.number_input("Axis 2 (x) coeff", value=-2.0, step=0.1)
-    b2y = st.number_input("Axis 2 (y) coeff", value=1.0, step=0.1)
+        b2x = round(st.number_input("Axis 2 (x) coeff", value=-2.0, step=0.1), 6)
+        b2y = round(st.number_input("Axis 2 (y) coeff", value=1.0, step=0.1), 6)
     
-    st.header("3. Origin Location")
-    c1 = st.number_input("Origin X", value=0.0, step=0.5)
-    c2 = st.number_input("Origin Y", value=0.0, step=0.5)
+        st.header("3. Origin Location")
+        c1 = round(st.number_input("Origin X", value=0.0, step=0.5), 6)
+        c2 = round(st.number_input("Origin Y", value=0.0, step=0.5), 6)
+        st.form_submit_button("Update")
 
 # 3. Calculations
-v_global = np.array([vx, vy])       
-origin_pos = np.array([c1, c2])     
-basis_matrix = np.array([[b1x, b2x], 
-                         [b1y, b2y]])
+@st.cache_data
+def compute_transform(vx, vy, b1x, b1y, b2x, b2y, c1, c2):
+    # CONDITIONS CHECK
+    det = b1x * b2y - b2x * b1y
 
-# CONDITIONS CHECK
-det = np.linalg.det(basis_matrix)
+    # A) Is it Perpendicular? (Dot product close to 0)
+    dot_prod = (b1x * b2x) + (b1y * b2y)
+    is_orthogonal = abs(dot_prod) < 1e-5
 
-# A) Is it Perpendicular? (Dot product close to 0)
-dot_prod = (b1x * b2x) + (b1y * b2y)
-is_orthogonal = abs(dot_prod) < 1e-5
+    # B) Is the Origin at (0,0)?
+    is_centered = math.hypot(c1, c2) < 1e-5
 
-# B) Is the Origin at (0,0)?
-is_centered = np.linalg.norm(origin_pos) < 1e-5
+    if abs(det) < 1e-10:
+        return None, None, is_orthogonal, is_centered, None
 
-if abs(det) < 1e-10:
-    st.error("⚠️ LINEAR DEPENDENCE ERROR: The basis vectors are parallel.")
-else:
     # --- Transformation Logic ---
-    v_relative = v_global - origin_pos
-    v_new_coords = np.linalg.solve(basis_matrix, v_relative)
+    v_rel_x = vx - c1
+    v_rel_y = vy - c2
+    # Cramer's rule: closed-form inverse of the 2x2 basis matrix
+    inv_det = 1.0 / det
+    v_new_coords = (( b2y * v_rel_x - b2x * v_rel_y) * inv_det,
+                    (-b1y * v_rel_x + b1x * v_rel_y) * inv_det)
+
+    rot_matrix = None
+    if is_orthogonal and is_centered:
+        # cos/sin of the angle of b1 come straight from its unit vector
+        r = math.hypot(b1x, b1y)
+        c, s = b1x / r, b1y / r
+        rot_matrix = np.array([
+            [c, -s],
+            [s,  c]
+        ])
+
+    return (v_rel_x, v_rel_y), v_new_coords, is_orthogonal, is_centered, rot_matrix
+
+(v_relative, v_new_coords,
+ is_orthogonal, is_centered, rot_matrix) = compute_transform(vx, vy, b1x, b1y, b2x, b2y, c1, c2)
+
+# Keyed on the 2-decimal display values, so tiny changes reuse the same string.
+@st.cache_data
+def rotation_latex(r00, r01, r10, r11):
+    return (r"R = \begin{bmatrix} " + 
+            f"{r00:.2f} & {r01:.2f} \\\\ " + 
+            f"{r10:.2f} & {r11:.2f}" + 
+            r" \end{bmatrix}")
+
+# The scene is sent to the browser as a small Vega-Lite spec and drawn client-side.
+def build_chart(vx, vy, b1x, b1y, b2x, b2y, c1, c2, is_centered, limit):
+    # Imported here so the linear-dependence error path never loads them.
+    import altair as alt
+    import pandas as pd
+
+    # Extended Axes Lines: long enough to cross the whole view, then clipped
+    axis_rows = []
+    for bx, by in ((b1x, b1y), (b2x, b2y)):
+        t = 4 * limit / math.hypot(bx, by)
+        axis_rows.append({'x': c1 - t*bx, 'y': c2 - t*by,
+                          'x2': c1 + t*bx, 'y2': c2 + t*by})
+
+    # All arrows as columns: start (X, Y), vector (U, V), one row per arrow
+    X = np.array([0, c1, c1, 0])
+    Y = np.array([0, c2, c2, 0])
+    U = np.array([c1, b1x, b2x, vx])
+    V = np.array([c2, b1y, b2y, vy])
+    arrows = pd.DataFrame({
+        'x': X, 'y': Y, 'x2': X + U, 'y2': Y + V,
+        'color': ['gray', 'green', 'green', 'blue'],
+        'label': ['Origin Shift', 'Basis 1', 'Basis 2', 'Global Vector'],
+        'width': [1.5, 3, 3, 4],
+        # Vega rotates symbols clockwise from "up"
+        'angle': np.degrees(np.arctan2(U, V)),
+    })
+    if is_centered:
+        arrows = arrows.iloc[1:]
+
+    x = alt.X('x:Q', scale=alt.Scale(domain=[-limit, limit]), title=None)
+    y = alt.Y('y:Q', scale=alt.Scale(domain=[-limit, limit]), title=None)
+    color = alt.Color('label:N', title=None,
+                      scale=alt.Scale(domain=list(arrows['label']), range=list(arrows['color'])),
+                      legend=alt.Legend(orient='bottom-right'))
+
+    zero_lines = alt.Chart(pd.DataFrame({'x': [0], 'y': [0]})).mark_rule(color='lightgray')
+    axis_lines = alt.Chart(pd.DataFrame(axis_rows)).mark_rule(
+        color='green', opacity=0.4, strokeDash=[4, 4], clip=True
+    ).encode(x=x, y=y, x2='x2:Q', y2='y2:Q')
+
+    shafts = alt.Chart(arrows).mark_rule(clip=True).encode(
+        x=x, y=y, x2='x2:Q', y2='y2:Q', color=color,
+        strokeWidth=alt.StrokeWidth('width:Q', scale=None, legend=None))
+    heads = alt.Chart(arrows).mark_point(shape='triangle-up', filled=True, opacity=1, clip=True).encode(
+        x=alt.X('x2:Q'), y=alt.Y('y2:Q'), color=color,
+        angle=alt.Angle('angle:Q', scale=None))
+
+    labels = [alt.Chart(pd.DataFrame({'x': [vx], 'y': [vy], 'text': [f"P({vx},{vy})"]})).mark_text(
+        align='left', dx=4, color='blue', fontWeight='bold', clip=True
+    ).encode(x=x, y=y, text='text:N')]
+    if not is_centered:
+        labels.append(alt.Chart(pd.DataFrame({'x': [c1], 'y': [c2], 'text': ["New Origin"]})).mark_text(
+            align='left', dx=4, color='green', fontSize=10, clip=True
+        ).encode(x=x, y=y, text='text:N'))
+
+    chart = alt.layer(
+        zero_lines.encode(x=x), zero_lines.encode(y=y),
+        axis_lines, shafts, heads, *labels
+    ).properties(width=560, height=560, title="Affine Transformation Simulation")
+    return chart.configure_axis(gridDash=[2, 3], gridOpacity=0.3)
 
+if v_new_coords is None:
+    st.error("⚠️ LINEAR DEPENDENCE ERROR: The basis vectors are parallel.")
+else:
     # 4. Display Results
     col1, col2 = st.columns(2)
     with col1:
@@ -66,19 +157,10 @@ else:
             st.write("✅ **Pure Rotation detected**")
             
             # Calculate angle
-            angle_rad = np.arctan2(b1y, b1x)
-            angle_deg = np.degrees(angle_rad)
-            
-            rot_matrix = np.array([
-                [np.cos(angle_rad), -np.sin(angle_rad)],
-                [np.sin(angle_rad),  np.cos(angle_rad)]
-            ])
+            angle_deg = math.degrees(math.atan2(b1y, b1x))
             
             st.write(f"**Rotation Matrix ($R$) for {angle_deg:.1f}°:**")
-            st.latex(r"R = \begin{bmatrix} " + 
-                     f"{rot_matrix[0,0]:.2f} & {rot_matrix[0,1]:.2f} \\\\ " + 
-                     f"{rot_matrix[1,0]:.2f} & {rot_matrix[1,1]:.2f}" + 
-                     r" \end{bmatrix}")
+            st.latex(rotation_latex(*(round(float(r), 2) for r in rot_matrix.flat)))
                      
         elif not is_centered:
             st.warning("⚠️ **Affine Shift Detected**")
@@ -90,43 +172,8 @@ else:
             st.write("Axes are not perpendicular.")
 
     # 5. Visualization
-    fig, ax = plt.subplots(figsize=(8, 8))
-    
-    limit = max(np.linalg.norm(v_global), np.linalg.norm(origin_pos), 4.0) * 1.5
-    ax.set_xlim(-limit, limit)
-    ax.set_ylim(-limit, limit)
-    ax.set_aspect('equal')
-    
-    ax.axhline(0, color='lightgray', linewidth=1)
-    ax.axvline(0, color='lightgray', linewidth=1)
-    ax.grid(True, linestyle=':', alpha=0.3)
-
-    # Extended Axes Lines
-    scale = 100
-    ax.plot([c1 - scale*b1x, c1 + scale*b1x], 
-            [c2 - scale*b1y, c2 + scale*b1y], 
-            color='green', alpha=0.4, linewidth=1, linestyle='--')
-    ax.plot([c1 - scale*b2x, c1 + scale*b2x], 
-            [c2 - scale*b2y, c2 + scale*b2y], 
-            color='green', alpha=0.4, linewidth=1, linestyle='--')
-
-    def draw_arrow(vec, start, color, label, width=0.006):
-        ax.quiver(start[0], start[1], vec[0], vec[1], 
-                  angles='xy', scale_units='xy', scale=1, 
-                  color=color, label=label, width=width)
-
-    if not is_centered:
-        draw_arrow(origin_pos, [0,0], 'gray', 'Origin Shift', width=0.004)
-        ax.text(c1, c2, " New Origin", color='green', fontsize=8)
-
-    draw_arrow([b1x, b1y], origin_pos, 'green', 'Basis 1', width=0.01)
-    draw_arrow([b2x, b2y], origin_pos, 'green', 'Basis 2', width=0.01)
-    draw_arrow(v_global, [0,0], 'blue', 'Global Vector', width=0.015)
-
-    ax.text(vx, vy, f" P({vx},{vy})", color='blue', fontweight='bold')
-
-    plt.legend(loc='lower right')
-    plt.title("Affine Transformation Simulation")
-    st.pyplot(fig)
-
-
+    limit = max(math.hypot(vx, vy), math.hypot(c1, c2), 4.0) * 1.5
+    # Keep the spec's 560x560 size; the default width="stretch" would widen only x
+    # and break the equal aspect ratio.
+    st.altair_chart(build_chart(vx, vy, b1x, b1y, b2x, b2y, c1, c2, is_centered, limit),
+                    width="content")